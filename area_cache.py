@@ -0,0 +1,126 @@
+import hashlib
+import os
+from collections import OrderedDict
+from vector_io import USE_ARROW, read_vector, vector_file_parts, write_vector
+
+# 1 acre = 4046.86 square meters
+SQM_PER_ACRE = 4046.86
+
+# Where projected layers are cached between runs (AREA_CACHE_DIR overrides it) and
+# how much disk they may use
+DEFAULT_CACHE_DIR = os.environ.get("AREA_CACHE_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "data_standardization", "areas")
+DEFAULT_CACHE_SIZE = 2 * 1024 ** 3  # 2 GB
+
+# Layers already loaded in this process, so identical inputs are only read once.
+# Only the most recent ones are kept, pipeline workers live across many stages
+_loaded_layers = OrderedDict()
+MAX_LOADED_LAYERS = 4
+
+
+def _cache_key(path, source_crs, target_crs):
+    # Every part of a shapefile counts, an attribute edit only changes the .dbf
+    key = f"{source_crs}|{target_crs}"
+    for part in vector_file_parts(path):
+        stat = os.stat(part)
+        key += f"|{os.path.abspath(part)}|{stat.st_mtime_ns}|{stat.st_size}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def _evict(cache_dir, max_cache_bytes):
+    """Deletes least recently used cache files until the cache fits the limit."""
+    entries = []
+    for file in os.listdir(cache_dir):
+        if file.endswith(".parquet") and ".tmp." not in file:
+            file_path = os.path.join(cache_dir, file)
+            stat = os.stat(file_path)
+            entries.append((stat.st_mtime, stat.st_size, file_path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, file_path in sorted(entries):
+        if total <= max_cache_bytes:
+            break
+        try:
+            os.remove(file_path)
+            total -= size
+        except OSError:
+            pass
+
+
+def _remember(key, gdf):
+    _loaded_layers[key] = gdf
+    while len(_loaded_layers) > MAX_LOADED_LAYERS:
+        _loaded_layers.popitem(last=False)
+
+
+def load_area_layer(path, target_crs, source_crs="EPSG:4326", cache_dir=DEFAULT_CACHE_DIR,
+                    max_cache_bytes=DEFAULT_CACHE_SIZE):
+    """Loads a layer projected to target_crs with per-feature area columns.
+
+    Results are memoized in memory for the current run and on disk as
+    GeoParquet, keyed by path, modification time, size (of the .shp and its
+    sidecar files for shapefiles) and both CRS, so comparing the same file
+    twice or rerunning a comparison skips the read, the reprojection and the
+    area computation. The disk cache is trimmed
+    least-recently-used first once it grows past max_cache_bytes, and is
+    skipped when pyarrow (needed for GeoParquet) isn't installed.
+
+    Args:
+        path (str): Path to the input vector layer.
+        target_crs (str): Projected CRS (in meters) to compute areas in.
+        source_crs (str): CRS assigned to the input before reprojecting.
+        cache_dir (str): Folder for the on-disk cache, None to disable it.
+        max_cache_bytes (int): Size limit of the on-disk cache.
+
+    Returns:
+        GeoDataFrame: Projected layer with 'area_sqm' and 'area_acres' columns.
+            The same object is returned for repeated calls within a run, copy
+            it before modifying.
+    """
+    key = _cache_key(path, source_crs, target_crs)
+    if key in _loaded_layers:
+        _loaded_layers.move_to_end(key)
+        return _loaded_layers[key]
+
+    cache_path = os.path.join(cache_dir, f"{key}.parquet") if cache_dir and USE_ARROW else None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            gdf = read_vector(cache_path)
+            os.utime(cache_path)  # mark as recently used
+            _remember(key, gdf)
+            return gdf
+        except Exception as e:
+            print(f"Ignoring unreadable cache entry {cache_path}: {e}")
+
+    # Ensure the layer is in the source CRS and reproject it
+    gdf = read_vector(path).set_crs(source_crs).to_crs(target_crs)
+
+    # Calculate the area in square meters and acres
+    gdf["area_sqm"] = gdf.geometry.area
+    gdf["area_acres"] = gdf["area_sqm"] / SQM_PER_ACRE
+
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write then rename so a concurrent run never reads a partial file
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp.parquet"
+        try:
+            write_vector(gdf, tmp_path)
+            os.replace(tmp_path, cache_path)
+            _evict(cache_dir, max_cache_bytes)
+        except Exception as e:
+            # The cache only saves time, the comparison goes on without it
+            print(f"Could not cache {path} in {cache_dir}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    _remember(key, gdf)
+    return gdf
+
+
+def clear_area_cache(cache_dir=DEFAULT_CACHE_DIR):
+    """Drops the in-memory layers and deletes the on-disk cache files."""
+    _loaded_layers.clear()
+    if cache_dir and os.path.isdir(cache_dir):
+        for file in os.listdir(cache_dir):
+            if file.endswith(".parquet"):
+                os.remove(os.path.join(cache_dir, file))
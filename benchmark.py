@@ -0,0 +1,229 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+# Synthetic data is placed in Sindh, like most of our AOIs
+ORIGIN_LON = 68.9
+ORIGIN_LAT = 25.6
+PIXEL_SIZE = 0.00003  # ~3 m at this latitude
+CROPS = ["sugarcane", "cotton", "wheat", "rice", "fallow"]
+
+
+def make_rasters(folder, count, size, band_count, seed=0):
+    """Writes count adjacent multiband uint16 GeoTIFFs of size x size pixels.
+
+    Args:
+        folder (str): Folder to write raster_<i>.tif files to.
+        count (int): Number of rasters, placed side by side from west to east.
+        size (int): Width and height of each raster in pixels.
+        band_count (int): Number of bands per raster.
+        seed (int): Random seed, the same seed gives the same rasters.
+
+    Returns:
+        tuple: (minx, miny, maxx, maxy) extent of all rasters in EPSG:4326.
+    """
+    from osgeo import gdal, osr
+    import numpy as np
+
+    os.makedirs(folder, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(4326)
+
+    driver = gdal.GetDriverByName("GTiff")
+    for i in range(count):
+        dataset = driver.Create(os.path.join(folder, f"raster_{i}.tif"), size, size, band_count,
+                                gdal.GDT_UInt16, options=["TILED=YES"])
+        dataset.SetGeoTransform((ORIGIN_LON + i * size * PIXEL_SIZE, PIXEL_SIZE, 0,
+                                 ORIGIN_LAT, 0, -PIXEL_SIZE))
+        dataset.SetProjection(srs.ExportToWkt())
+        # Write in strips so large rasters don't need to fit in memory
+        for row in range(0, size, 512):
+            rows = min(512, size - row)
+            for b in range(1, band_count + 1):
+                dataset.GetRasterBand(b).WriteArray(
+                    rng.integers(1, 4000, size=(rows, size), dtype=np.uint16), 0, row)
+        dataset = None
+
+    return (ORIGIN_LON, ORIGIN_LAT - size * PIXEL_SIZE,
+            ORIGIN_LON + count * size * PIXEL_SIZE, ORIGIN_LAT)
+
+
+def make_polygons(path, extent, feature_count, seed=0):
+    """Writes a grid of about feature_count square fields with random classes.
+
+    Args:
+        path (str): Output layer path (.shp, .parquet or .fgb).
+        extent (tuple): (minx, miny, maxx, maxy) to cover, in EPSG:4326.
+        feature_count (int): Approximate number of polygons.
+        seed (int): Random seed, the same seed gives the same layer.
+    """
+    import geopandas as gpd
+    import numpy as np
+    from shapely.geometry import box
+    from vector_io import write_vector
+
+    rng = np.random.default_rng(seed)
+    minx, miny, maxx, maxy = extent
+    columns = max(1, int(round((feature_count * (maxx - minx) / (maxy - miny)) ** 0.5)))
+    rows = max(1, int(round(feature_count / columns)))
+    width = (maxx - minx) / columns
+    height = (maxy - miny) / rows
+
+    geometries = [box(minx + c * width, miny + r * height, minx + (c + 1) * width, miny + (r + 1) * height)
+                  for r in range(rows) for c in range(columns)]
+    gdf = gpd.GeoDataFrame({
+        "predicted": rng.integers(1, 6, size=len(geometries)),
+        "crop": rng.choice(CROPS, size=len(geometries)),
+    }, geometry=geometries, crs="EPSG:4326")
+    write_vector(gdf, path)
+
+
+def make_mask(path, extent, crs="EPSG:4326"):
+    """Writes a boundary layer covering the middle of the extent, in the given CRS."""
+    import geopandas as gpd
+    from shapely.geometry import box
+    from vector_io import write_vector
+
+    minx, miny, maxx, maxy = extent
+    dx = (maxx - minx) / 4
+    dy = (maxy - miny) / 4
+    gdf = gpd.GeoDataFrame({"name": ["west", "east"]},
+                           geometry=[box(minx + dx, miny + dy, minx + 2 * dx, maxy - dy),
+                                     box(minx + 2 * dx, miny + dy, maxx - dx, maxy - dy)],
+                           crs="EPSG:4326")
+    write_vector(gdf.to_crs(crs), path)
+
+
+def _folder_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+
+def run_benchmark(workdir, raster_count=2, raster_size=2048, band_count=6, feature_count=10000, seed=0):
+    """Generates synthetic data in workdir and runs every stage on it once.
+
+    Returns:
+        dict: Benchmark configuration, platform and the metrics of each stage.
+    """
+    # Imported here so AREA_CACHE_DIR (set by main) is seen by area_cache
+    import profiling
+    from compressed_raster import compression, extract_bands, mosaicing, rescale
+    from dissolve_shapefile import dissolve_shapefile
+    from raster_clip import clip_raster
+    from shapefile_area_comparison import compare_areas
+    from shapefile_clip import clip_shapefile
+    from shapefile_metadata import shapefile_metadata
+    from zip_shapefile import zip_shapefiles
+
+    raw_folder = os.path.join(workdir, "raw")
+    extracted_folder = os.path.join(workdir, "extracted")
+    raster_folder = os.path.join(workdir, "rasters")
+    vector_folder = os.path.join(workdir, "vectors")
+    output_folder = os.path.join(workdir, "outputs")
+    for folder in (extracted_folder, raster_folder, vector_folder, output_folder):
+        os.makedirs(folder, exist_ok=True)
+
+    print("generating synthetic data")
+    start_time = time.perf_counter()
+    extent = make_rasters(raw_folder, raster_count, raster_size, band_count, seed)
+    polygons = os.path.join(vector_folder, "fields.shp")
+    make_polygons(polygons, extent, feature_count, seed)
+    mask_4326 = os.path.join(vector_folder, "boundary.shp")
+    make_mask(mask_4326, extent)
+    mask_3857 = os.path.join(output_folder, "boundary_3857.shp")
+    make_mask(mask_3857, extent, "EPSG:3857")
+    generation_time = time.perf_counter() - start_time
+
+    mosaic = os.path.join(raster_folder, "mosaiced.tif")
+    rescaled = os.path.join(raster_folder, "rescaled.tif")
+    compressed = os.path.join(raster_folder, "compressed.tif")
+    dissolved = os.path.join(output_folder, "fields_dissolved.shp")
+
+    stages = [
+        ("extract", lambda: extract_bands(raw_folder, extracted_folder, [6, 4, 2])),
+        ("mosaic", lambda: mosaicing(extracted_folder, mosaic)),
+        ("rescale", lambda: rescale(mosaic, rescaled, 4.0)),
+        ("compress", lambda: compression(rescaled, compressed)),
+        ("clip_raster", lambda: clip_raster(compressed, mask_3857, os.path.join(output_folder, "clip.tif"))),
+        ("clip_vector", lambda: clip_shapefile(polygons, mask_4326, os.path.join(output_folder, "fields_clip.shp"))),
+        ("dissolve", lambda: dissolve_shapefile(polygons, dissolved, "predicted")),
+        ("area", lambda: compare_areas(polygons, dissolved)),
+        ("metadata", lambda: shapefile_metadata(vector_folder)),
+        ("zip", lambda: zip_shapefiles(vector_folder, os.path.join(output_folder, "zipped"))),
+    ]
+
+    results = []
+    collected = []
+    profiling.add_sink(collected.append)
+    try:
+        for name, run in stages:
+            collected.clear()
+            run()
+            # The stage's own decorator reports last, after any nested stages
+            metrics = dict(collected[-1]) if collected else {}
+            metrics["benchmark_stage"] = name
+            results.append(metrics)
+            print(f"{name}: {metrics.get('wall_time_s')} s, peak RSS {metrics.get('peak_rss_mb')} MB")
+    finally:
+        profiling.remove_sink(collected.append)
+
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "config": {
+            "raster_count": raster_count,
+            "raster_size": raster_size,
+            "band_count": band_count,
+            "feature_count": feature_count,
+            "seed": seed,
+        },
+        "platform": {
+            "python": platform.python_version(),
+            "system": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+        },
+        "input_bytes": {
+            "rasters": _folder_size(raw_folder),
+            "vectors": _folder_size(vector_folder),
+        },
+        "generation_time_s": round(generation_time, 4),
+        "stages": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every stage on synthetic rasters and polygons.")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file to write the results to")
+    parser.add_argument("--rasters", type=int, default=2, help="Number of input rasters")
+    parser.add_argument("--raster-size", type=int, default=2048, help="Width/height of each raster in pixels")
+    parser.add_argument("--bands", type=int, default=6, help="Bands per raster (at least 6)")
+    parser.add_argument("--features", type=int, default=10000, help="Number of polygons")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", default=None, help="Keep the generated data in this folder")
+    args = parser.parse_args()
+    if args.bands < 6:
+        parser.error("--bands must be at least 6, the extract stage reads bands 6, 4 and 2")
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="data_standardization_bench_")
+    # Keep the area cache inside the workdir so runs are cold and don't touch the user's cache
+    os.environ["AREA_CACHE_DIR"] = os.path.join(workdir, "area_cache")
+    try:
+        results = run_benchmark(workdir, args.rasters, args.raster_size, args.bands, args.features, args.seed)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved as {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+import geopandas as gpd
+import pandas as pd
+from shapely.geometry import box
+from area_cache import SQM_PER_ACRE, load_area_layer
+from profiling import profiled
+from vector_io import write_vector
+
+# Label used for area covered by only one of the two layers
+NO_CLASS = "none"
+
+
+def _tile_boxes(bounds, tile_size):
+    minx, miny, maxx, maxy = bounds
+    columns = max(1, math.ceil((maxx - minx) / tile_size))
+    rows = max(1, math.ceil((maxy - miny) / tile_size))
+    for col in range(columns):
+        for row in range(rows):
+            x0 = minx + col * tile_size
+            y0 = miny + row * tile_size
+            yield box(x0, y0, min(x0 + tile_size, maxx), min(y0 + tile_size, maxy))
+
+
+def _compare_tile(tile, before, after):
+    """Overlays the two layers inside one tile and returns the labelled pieces."""
+    before = gpd.clip(before, tile)
+    after = gpd.clip(after, tile)
+    if before.empty and after.empty:
+        return None
+    if before.empty:
+        pieces = after.assign(class_1=NO_CLASS)
+    elif after.empty:
+        pieces = before.assign(class_2=NO_CLASS)
+    else:
+        # union keeps the shared parts (both classes) as well as the parts
+        # only one of the layers covers (the other class is missing)
+        pieces = gpd.overlay(before, after, how="union", keep_geom_type=True)
+        pieces[["class_1", "class_2"]] = pieces[["class_1", "class_2"]].fillna(NO_CLASS)
+
+    pieces = pieces[["class_1", "class_2", "geometry"]].copy()
+    pieces["area_acres"] = pieces.geometry.area / SQM_PER_ACRE
+    return pieces[pieces["area_acres"] > 0]
+
+
+@profiled("change")
+def compare_classifications(before_path, after_path, output_path, class_field="predicted",
+                            target_crs="EPSG:32642", source_crs="EPSG:4326", tile_size=10000,
+                            processes=None):
+    """Computes where and between which classes two classification layers differ.
+
+    Both layers are reprojected (through the area cache) and cut into square
+    tiles. Each tile only receives the features its bounding box hits in the
+    layers' spatial indexes, and tiles are overlaid in parallel across
+    processes. Area covered by only one of the layers is labelled "none" in
+    the transition matrix.
+
+    Args:
+        before_path (str): Path to the earlier classification layer.
+        after_path (str): Path to the later classification layer.
+        output_path (str): Path for the difference polygons, one (multi)polygon
+            per class transition (.shp, .parquet or .fgb). The transition
+            matrix is written next to it as a .csv.
+        class_field (str): Column holding the class of each feature.
+        target_crs (str): Projected CRS (in meters) to compute areas in.
+        source_crs (str): CRS assigned to the inputs before reprojecting.
+        tile_size (float): Tile edge length in target CRS units.
+        processes (int): Number of worker processes, defaults to all cores.
+
+    Returns:
+        tuple: (transition matrix in acres with before classes as rows and
+            after classes as columns, per-class DataFrame with 'unchanged',
+            'loss' and 'gain' acres).
+    """
+    before = load_area_layer(before_path, target_crs, source_crs)
+    after = load_area_layer(after_path, target_crs, source_crs)
+    # Fix geometries and keep only the class column
+    before = gpd.GeoDataFrame({"class_1": before[class_field].astype(str)},
+                              geometry=before.geometry.buffer(0), crs=before.crs)
+    after = gpd.GeoDataFrame({"class_2": after[class_field].astype(str)},
+                             geometry=after.geometry.buffer(0), crs=after.crs)
+
+    bounds = (min(before.total_bounds[0], after.total_bounds[0]),
+              min(before.total_bounds[1], after.total_bounds[1]),
+              max(before.total_bounds[2], after.total_bounds[2]),
+              max(before.total_bounds[3], after.total_bounds[3]))
+
+    pieces = []
+    with ProcessPoolExecutor(processes) as executor:
+        futures = []
+        for tile in _tile_boxes(bounds, tile_size):
+            before_idx = before.sindex.query(tile, predicate="intersects")
+            after_idx = after.sindex.query(tile, predicate="intersects")
+            if len(before_idx) == 0 and len(after_idx) == 0:
+                continue
+            futures.append(executor.submit(_compare_tile, tile, before.iloc[before_idx], after.iloc[after_idx]))
+        print(f"Comparing {len(futures)} tiles")
+
+        for future in futures:
+            result = future.result()
+            if result is not None and not result.empty:
+                pieces.append(result)
+
+    if pieces:
+        pieces = gpd.GeoDataFrame(pd.concat(pieces, ignore_index=True), crs=before.crs)
+    else:
+        pieces = gpd.GeoDataFrame({"class_1": [], "class_2": [], "area_acres": []},
+                                  geometry=[], crs=before.crs)
+
+    # Transition matrix: acres moving from each before class to each after class
+    matrix = pieces.pivot_table(index="class_1", columns="class_2", values="area_acres",
+                                aggfunc="sum", fill_value=0.0)
+    classes = sorted(set(matrix.index) | set(matrix.columns))
+    matrix = matrix.reindex(index=classes, columns=classes, fill_value=0.0)
+    matrix.index.name = "before"
+    matrix.columns.name = "after"
+
+    unchanged = pd.Series([matrix.at[c, c] for c in classes], index=classes)
+    summary = pd.DataFrame({
+        "unchanged": unchanged,
+        "loss": matrix.sum(axis=1) - unchanged,
+        "gain": matrix.sum(axis=0) - unchanged,
+    })
+    # Area only one layer covers already counts as loss or gain of its class
+    summary = summary.drop(index=NO_CLASS, errors="ignore")
+    summary.index.name = class_field
+
+    # Save the polygons whose class changed, merged across tile borders, and
+    # the matrix next to them
+    changed = pieces[pieces["class_1"] != pieces["class_2"]]
+    changed = changed.dissolve(by=["class_1", "class_2"], aggfunc="sum", as_index=False)
+    write_vector(changed, output_path)
+    matrix.to_csv(os.path.splitext(output_path)[0] + "_transition_matrix.csv")
+
+    print(f"Change polygons saved as {output_path}")
+
+    return matrix, summary
+
+
+if __name__ == "__main__":
+    # Example usage
+    before_path = r"D:\5) Corteva Agriscience\9) Corteva Fall Maize Classification 2021\raw\week_1_classification.shp"
+    after_path = r"D:\5) Corteva Agriscience\9) Corteva Fall Maize Classification 2021\raw\week_2_classification.shp"
+    output_path = r"D:\5) Corteva Agriscience\9) Corteva Fall Maize Classification 2021\raw\week_1_to_2_changes.parquet"
+
+    matrix, summary = compare_classifications(before_path, after_path, output_path)
+
+    print("\nClass transition matrix (acres):")
+    print(matrix.round(2).to_string())
+    print("\nPer-class change (acres):")
+    print(summary.round(2).to_string())
@@ -0,0 +1,245 @@
+import argparse
+import os
+import sys
+from pipeline import Command, run_pipeline
+
+# Modules are imported inside the handlers so a subcommand only needs the
+# dependencies of the scripts it actually runs (gdal, rasterio, boto3, ...)
+
+RASTER_EXTENSIONS = (".tif", ".tiff", ".vrt", ".img", ".jp2")
+
+
+def extract(input_folder, output_folder, bands):
+    from compressed_raster import extract_bands
+    os.makedirs(output_folder, exist_ok=True)
+    extract_bands(input_folder, output_folder, [int(b) for b in bands])
+
+
+def mosaic(img_folder, output_raster):
+    from compressed_raster import mosaicing
+    mosaicing(img_folder, output_raster)
+
+
+def rescale(input_path, output_path, brightness_factor=1.0):
+    from compressed_raster import rescale as rescale_raster
+    rescale_raster(input_path, output_path, float(brightness_factor))
+
+
+def compress(input_image, output_image):
+    from compressed_raster import compression
+    compression(input_image, output_image)
+
+
+def tiles(input_image, output_path, min_zoom, max_zoom, tile_format="xyz", processes=None):
+    from compressed_raster import export_tiles
+    export_tiles(input_image, output_path, int(min_zoom), int(max_zoom), tile_format, processes)
+
+
+def clip(input_path, mask_path, output_path):
+    # Rasters are clipped with rasterio, vector layers with an overlay
+    if os.path.splitext(input_path)[1].lower() in RASTER_EXTENSIONS:
+        from raster_clip import clip_raster
+        clip_raster(input_path, mask_path, output_path)
+    else:
+        from shapefile_clip import clip_shapefile
+        clip_shapefile(input_path, mask_path, output_path)
+
+
+def dissolve(input_shapefile, output_shapefile, dissolve_field="predicted"):
+    from dissolve_shapefile import dissolve_shapefile
+    dissolve_shapefile(input_shapefile, output_shapefile, dissolve_field)
+
+
+def standardize(input_folder, mode="attribute"):
+    if mode == "attribute":
+        from convert_shapefile_attribute import standardize_attributes
+        standardize_attributes(input_folder)
+    elif mode == "datatype":
+        from convert_shapefile_predicted_datatype import convert_predicted_datatype
+        convert_predicted_datatype(input_folder)
+    else:
+        raise ValueError(f"Unknown standardize mode: {mode}")
+
+
+def metadata(input_folder, output_path=None):
+    from shapefile_metadata import shapefile_metadata
+    shapefile_metadata(input_folder, output_path)
+
+
+def zip_folder(input_folder, output_folder):
+    from zip_shapefile import zip_shapefiles
+    zip_shapefiles(input_folder, output_folder)
+
+
+def convert(input_folder, output_folder, extension=".parquet"):
+    from vector_io import convert_vector_archive
+    convert_vector_archive(input_folder, output_folder, extension)
+
+
+def area(shapefile1_path, shapefile2_path, source_crs="EPSG:4326", target_crs="EPSG:32642", summary=False):
+    if summary:
+        from shapefile_area_analyzer import analyze_areas
+        analyze_areas(shapefile1_path, shapefile2_path, source_crs, target_crs)
+    else:
+        from shapefile_area_comparison import compare_areas
+        compare_areas(shapefile1_path, shapefile2_path, source_crs, target_crs)
+
+
+def change(before_path, after_path, output_path, class_field="predicted", target_crs="EPSG:32642",
+           source_crs="EPSG:4326", tile_size=10000, processes=None):
+    from classification_change import compare_classifications
+    compare_classifications(before_path, after_path, output_path, class_field, target_crs, source_crs,
+                            float(tile_size), processes)
+
+
+def zonal(raster_path, zones_path, output_path, zone_field=None, band=1, categorical=None, classes=None):
+    from zonal_stats import zonal_statistics
+    zonal_statistics(raster_path, zones_path, output_path, zone_field, int(band), categorical,
+                     None if classes is None else [int(c) for c in classes])
+
+
+def s3_inventory(bucket_name, specific_folder=None, output_path=None):
+    from s3_bucket_summary import S3BucketAnalyzer
+    # Credentials come from the environment (or boto3's usual config files)
+    analyzer = S3BucketAnalyzer(os.environ.get("AWS_ACCESS_KEY_ID"), os.environ.get("AWS_SECRET_ACCESS_KEY"))
+    if specific_folder and not specific_folder.endswith("/"):
+        specific_folder += "/"
+    analyzer.generate_report(bucket_name, output_path=output_path, specific_folder=specific_folder)
+
+
+# Command name -> handler and the names of its input and output path arguments
+COMMANDS = {
+    "extract": Command(extract, ["input_folder"], ["output_folder"]),
+    "mosaic": Command(mosaic, ["img_folder"], ["output_raster"]),
+    "rescale": Command(rescale, ["input_path"], ["output_path"]),
+    "compress": Command(compress, ["input_image"], ["output_image"]),
+    "tiles": Command(tiles, ["input_image"], ["output_path"]),
+    "clip": Command(clip, ["input_path", "mask_path"], ["output_path"]),
+    "dissolve": Command(dissolve, ["input_shapefile"], ["output_shapefile"]),
+    "standardize": Command(standardize, ["input_folder"], []),
+    "metadata": Command(metadata, ["input_folder"], ["output_path"]),
+    "zip": Command(zip_folder, ["input_folder"], ["output_folder"]),
+    "convert": Command(convert, ["input_folder"], ["output_folder"]),
+    "area": Command(area, ["shapefile1_path", "shapefile2_path"], []),
+    "change": Command(change, ["before_path", "after_path"], ["output_path"]),
+    "zonal": Command(zonal, ["raster_path", "zones_path"], ["output_path"]),
+    "s3-inventory": Command(s3_inventory, [], ["output_path"]),
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Data standardization tools for raster imagery and shapefiles.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p = subparsers.add_parser("run", help="Run a pipeline file (.toml/.yaml) of chained stages")
+    p.add_argument("config_path")
+    p.add_argument("--workers", type=int, default=None, help="Stages to run at once (default: all cores)")
+    p.add_argument("--force", action="store_true", help="Rerun stages even if they are up to date")
+    p.add_argument("--dry-run", action="store_true", help="Only show which stages would run")
+
+    p = subparsers.add_parser("extract", help="Extract bands from every .tif in a folder")
+    p.add_argument("input_folder")
+    p.add_argument("output_folder")
+    p.add_argument("--bands", type=int, nargs="+", default=[6, 4, 2])
+
+    p = subparsers.add_parser("mosaic", help="Mosaic a folder of .tif files to EPSG:3857")
+    p.add_argument("img_folder")
+    p.add_argument("output_raster")
+
+    p = subparsers.add_parser("rescale", help="Rescale a raster to 8 bit")
+    p.add_argument("input_path")
+    p.add_argument("output_path")
+    p.add_argument("--brightness-factor", dest="brightness_factor", type=float, default=1.0)
+
+    p = subparsers.add_parser("compress", help="LZW compress a raster")
+    p.add_argument("input_image")
+    p.add_argument("output_image")
+
+    p = subparsers.add_parser("tiles", help="Export an EPSG:3857 raster as web tiles")
+    p.add_argument("input_image")
+    p.add_argument("output_path")
+    p.add_argument("--min-zoom", dest="min_zoom", type=int, default=10)
+    p.add_argument("--max-zoom", dest="max_zoom", type=int, default=18)
+    p.add_argument("--format", dest="tile_format", choices=["xyz", "mbtiles", "gpkg"], default="xyz")
+    p.add_argument("--processes", type=int, default=None)
+
+    p = subparsers.add_parser("clip", help="Clip a raster or vector layer to boundary polygons")
+    p.add_argument("input_path")
+    p.add_argument("mask_path")
+    p.add_argument("output_path")
+
+    p = subparsers.add_parser("dissolve", help="Dissolve a layer by an attribute")
+    p.add_argument("input_shapefile")
+    p.add_argument("output_shapefile")
+    p.add_argument("--field", dest="dissolve_field", default="predicted")
+
+    p = subparsers.add_parser("standardize", help="Standardize the 'predicted' column of a folder of layers")
+    p.add_argument("input_folder")
+    p.add_argument("--mode", choices=["attribute", "datatype"], default="attribute",
+                   help="attribute: first numeric column becomes 'predicted'; "
+                        "datatype: string 'predicted' becomes integer")
+
+    p = subparsers.add_parser("metadata", help="List the columns of every shapefile in a folder")
+    p.add_argument("input_folder")
+    p.add_argument("--output", dest="output_path", default=None)
+
+    p = subparsers.add_parser("zip", help="Zip every shapefile in a folder")
+    p.add_argument("input_folder")
+    p.add_argument("output_folder")
+
+    p = subparsers.add_parser("convert", help="Convert a folder of (zipped) shapefiles to GeoParquet/FlatGeobuf")
+    p.add_argument("input_folder")
+    p.add_argument("output_folder")
+    p.add_argument("--extension", choices=[".parquet", ".fgb"], default=".parquet")
+
+    p = subparsers.add_parser("area", help="Compare the area of two layers")
+    p.add_argument("shapefile1_path")
+    p.add_argument("shapefile2_path")
+    p.add_argument("--source-crs", dest="source_crs", default="EPSG:4326")
+    p.add_argument("--target-crs", dest="target_crs", default="EPSG:32642")
+    p.add_argument("--summary", action="store_true", help="Also break areas down by categorical attributes")
+
+    p = subparsers.add_parser("change", help="Per-class change between two classification layers")
+    p.add_argument("before_path")
+    p.add_argument("after_path")
+    p.add_argument("output_path")
+    p.add_argument("--field", dest="class_field", default="predicted")
+    p.add_argument("--source-crs", dest="source_crs", default="EPSG:4326")
+    p.add_argument("--target-crs", dest="target_crs", default="EPSG:32642")
+    p.add_argument("--tile-size", dest="tile_size", type=float, default=10000)
+    p.add_argument("--processes", type=int, default=None)
+
+    p = subparsers.add_parser("zonal", help="Summarize a raster per boundary polygon")
+    p.add_argument("raster_path")
+    p.add_argument("zones_path")
+    p.add_argument("output_path")
+    p.add_argument("--zone-field", dest="zone_field", default=None)
+    p.add_argument("--band", type=int, default=1)
+    p.add_argument("--continuous", dest="categorical", action="store_const", const=False, default=None,
+                   help="Skip the per-class acres (default for non-8 bit rasters without --classes)")
+    p.add_argument("--classes", type=int, nargs="+", default=None,
+                   help="Class values to report acres for (needed for 16/32 bit class rasters)")
+
+    p = subparsers.add_parser("s3-inventory", help="Excel inventory of an S3 bucket or folder")
+    p.add_argument("bucket_name")
+    p.add_argument("--folder", dest="specific_folder", default=None)
+    p.add_argument("--output", dest="output_path", default=None)
+
+    return parser
+
+
+def main(argv=None):
+    args = vars(build_parser().parse_args(argv))
+    command = args.pop("command")
+
+    if command == "run":
+        ok = run_pipeline(args["config_path"], COMMANDS, workers=args["workers"], force=args["force"],
+                          dry_run=args["dry_run"])
+        return 0 if ok else 1
+
+    COMMANDS[command].handler(**args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,19 @@
 from osgeo import gdal
+from multiprocessing import Pool
 import numpy as np
 import glob
+import math
 import os
+import shutil
+import sqlite3
 import time   
+from profiling import profiled
 
+# EPSG:3857 extent and web tile size
+WEB_MERCATOR_ORIGIN = 20037508.342789244
+TILE_SIZE = 256
+
+@profiled("compress")
 def compression(input_image, output_image):
     print("compressing")
     input_dataset = gdal.Open(input_image)
@@ -19,6 +29,7 @@ def compression(input_image, output_image):
     input_dataset = None
     output_dataset = None
 
+@profiled("rescale")
 def rescale(input_path, output_path, brightness_factor):
     print("rescaling")
     input_ds = gdal.Open(input_path)
@@ -57,6 +68,7 @@ def rescale(input_path, output_path, brightness_factor):
     output_ds = None
 
 
+@profiled("mosaic")
 def mosaicing(img_folder, output_raster):
     print("mosaicing")
     tif_files = glob.glob(os.path.join(img_folder, '*.tif'))
@@ -66,6 +78,7 @@ def mosaicing(img_folder, output_raster):
                         dstNodata = NODATA_VALUE)
     g = None
 
+@profiled("extract")
 def extract_bands(input_folder, output_folder, bands):
     mosaic = False
     tif_files = glob.glob(os.path.join(input_folder, '*.tif'))
@@ -103,27 +116,360 @@ def extract_bands(input_folder, output_folder, bands):
 
     return mosaic
 
-t1 = int(time.time())
-#imagery folder
-input_path = r"D:\Data\Mirpurkhas\1_raster_images\skywatch\raw"
-#output folder
-extracted_folder = r"D:\Data\Mirpurkhas\1_raster_images\skywatch\raw\4.0"
-#rgb bands
-bands = [6, 4, 2]
-#brightness factor for final imagery
-brightness_factor = 4.0
+def _tile_bounds(z, x, y):
+    tile_span = 2 * WEB_MERCATOR_ORIGIN / (2 ** z)
+    minx = -WEB_MERCATOR_ORIGIN + x * tile_span
+    maxy = WEB_MERCATOR_ORIGIN - y * tile_span
+    return minx, maxy - tile_span, minx + tile_span, maxy
+
+def _tile_range(geotransform, xsize, ysize, z):
+    # XYZ tiles that intersect the raster extent at zoom z
+    minx = geotransform[0]
+    maxy = geotransform[3]
+    maxx = minx + xsize * geotransform[1]
+    miny = maxy + ysize * geotransform[5]
+    tile_span = 2 * WEB_MERCATOR_ORIGIN / (2 ** z)
+    last = 2 ** z - 1
+    x0 = max(0, int(math.floor((minx + WEB_MERCATOR_ORIGIN) / tile_span)))
+    x1 = min(last, int(math.floor((maxx + WEB_MERCATOR_ORIGIN) / tile_span)))
+    y0 = max(0, int(math.floor((WEB_MERCATOR_ORIGIN - maxy) / tile_span)))
+    y1 = min(last, int(math.floor((WEB_MERCATOR_ORIGIN - miny) / tile_span)))
+    return x0, x1, y0, y1
+
+def _build_overviews(input_image):
+    # an .ovr older than the image belongs to a previous version of the mosaic
+    ovr_path = input_image + ".ovr"
+    if os.path.exists(ovr_path) and os.path.getmtime(ovr_path) < os.path.getmtime(input_image):
+        os.remove(ovr_path)
+
+    input_ds = gdal.Open(input_image)
+    if input_ds.GetRasterBand(1).GetOverviewCount() > 0:
+        input_ds = None
+        return
+
+    print("building overviews")
+    levels = []
+    factor = 2
+    while min(input_ds.RasterXSize, input_ds.RasterYSize) / factor >= TILE_SIZE:
+        levels.append(factor)
+        factor *= 2
+    if levels:
+        # read-only open writes an external .ovr next to the mosaic
+        gdal.SetConfigOption("COMPRESS_OVERVIEW", "LZW")
+        input_ds.BuildOverviews("AVERAGE", levels)
+    input_ds = None
+
+_tile_ds = None
+
+def _open_tile_source(input_image):
+    # one dataset handle per worker process, GDAL handles can't be pickled
+    global _tile_ds
+    _tile_ds = gdal.Open(input_image)
+
+def _render_tile(tile):
+    z, x, y = tile
+    ds = _tile_ds
+    geotransform = ds.GetGeoTransform()
+    minx, miny, maxx, maxy = _tile_bounds(z, x, y)
+
+    # tile extent in source pixel coordinates
+    px0 = (minx - geotransform[0]) / geotransform[1]
+    px1 = (maxx - geotransform[0]) / geotransform[1]
+    py0 = (maxy - geotransform[3]) / geotransform[5]
+    py1 = (miny - geotransform[3]) / geotransform[5]
+    scale_x = TILE_SIZE / (px1 - px0)
+    scale_y = TILE_SIZE / (py1 - py0)
+
+    # clamp the read window to the raster, tiles on the edge are partial
+    rx0 = max(0, int(math.floor(px0)))
+    ry0 = max(0, int(math.floor(py0)))
+    rx1 = min(ds.RasterXSize, int(math.ceil(px1)))
+    ry1 = min(ds.RasterYSize, int(math.ceil(py1)))
+    if rx1 <= rx0 or ry1 <= ry0:
+        return tile, None
+
+    bx0 = int(round((rx0 - px0) * scale_x))
+    by0 = int(round((ry0 - py0) * scale_y))
+    bx1 = min(TILE_SIZE, int(round((rx1 - px0) * scale_x)))
+    by1 = min(TILE_SIZE, int(round((ry1 - py0) * scale_y)))
+    if bx1 <= bx0 or by1 <= by0:
+        return tile, None
+
+    band_count = min(ds.RasterCount, 3)
+    # reading into a smaller buffer lets GDAL pick the matching overview
+    data = ds.ReadAsArray(rx0, ry0, rx1 - rx0, ry1 - ry0,
+                          buf_xsize=bx1 - bx0, buf_ysize=by1 - by0,
+                          band_list=list(range(1, band_count + 1)),
+                          resample_alg=gdal.GRIORA_Average)
+    if data.ndim == 2:
+        data = data[np.newaxis]
+
+    alpha = np.any(data != 0, axis=0)
+    if not alpha.any():
+        return tile, None
+
+    rgba = np.zeros((4, TILE_SIZE, TILE_SIZE), dtype=np.uint8)
+    for b in range(3):
+        rgba[b, by0:by1, bx0:bx1] = data[min(b, band_count - 1)]
+    rgba[3, by0:by1, bx0:bx1] = alpha * 255
+
+    mem_ds = gdal.GetDriverByName("MEM").Create("", TILE_SIZE, TILE_SIZE, 4, gdal.GDT_Byte)
+    for b in range(4):
+        mem_ds.GetRasterBand(b + 1).WriteArray(rgba[b])
+
+    vsi_path = f"/vsimem/tile_{os.getpid()}_{z}_{x}_{y}.png"
+    gdal.GetDriverByName("PNG").CreateCopy(vsi_path, mem_ds)
+    mem_ds = None
+
+    f = gdal.VSIFOpenL(vsi_path, "rb")
+    gdal.VSIFSeekL(f, 0, 2)
+    size = gdal.VSIFTellL(f)
+    gdal.VSIFSeekL(f, 0, 0)
+    png = gdal.VSIFReadL(1, size, f)
+    gdal.VSIFCloseL(f)
+    gdal.Unlink(vsi_path)
+    return tile, png
+
+def _source_signature(input_image):
+    # identifies the mosaic the tiles were cut from
+    stat = os.stat(input_image)
+    return f"{os.path.abspath(input_image)}|{stat.st_mtime_ns}|{stat.st_size}"
+
+def _open_xyz(output_path, source):
+    os.makedirs(output_path, exist_ok=True)
+    stamp_path = os.path.join(output_path, ".source")
+    previous = None
+    if os.path.exists(stamp_path):
+        with open(stamp_path, "r", encoding="utf-8") as f:
+            previous = f.read().strip()
+
+    if previous != source:
+        # tiles of another mosaic (or of unknown origin) can't be resumed
+        for name in os.listdir(output_path):
+            if name.isdigit():
+                print(f"removing stale zoom level {name}")
+                shutil.rmtree(os.path.join(output_path, name))
+        if os.path.exists(os.path.join(output_path, ".empty")):
+            os.remove(os.path.join(output_path, ".empty"))
+        with open(stamp_path, "w", encoding="utf-8") as f:
+            f.write(source)
+
+    empty = set()
+    if os.path.exists(os.path.join(output_path, ".empty")):
+        with open(os.path.join(output_path, ".empty"), "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.strip().split("/")
+                if len(parts) == 3:
+                    empty.add(tuple(int(v) for v in parts))
+    return empty
+
+def _open_mbtiles(output_path, min_zoom, max_zoom, bounds, source):
+    db = sqlite3.connect(output_path)
+    db.execute("CREATE TABLE IF NOT EXISTS metadata (name TEXT, value TEXT)")
+    db.execute("CREATE TABLE IF NOT EXISTS tiles (zoom_level INTEGER, tile_column INTEGER, "
+               "tile_row INTEGER, tile_data BLOB)")
+    db.execute("CREATE UNIQUE INDEX IF NOT EXISTS tile_index ON tiles "
+               "(zoom_level, tile_column, tile_row)")
+    # tiles found empty, so a resumed export doesn't render them again
+    db.execute("CREATE TABLE IF NOT EXISTS empty_tiles (zoom_level INTEGER, tile_column INTEGER, "
+               "tile_row INTEGER, PRIMARY KEY (zoom_level, tile_column, tile_row))")
+
+    previous = db.execute("SELECT value FROM metadata WHERE name = 'source'").fetchone()
+    if previous is None or previous[0] != source:
+        # tiles of another mosaic (or of unknown origin) can't be resumed
+        print("removing stale tiles")
+        db.execute("DELETE FROM tiles")
+        db.execute("DELETE FROM empty_tiles")
+
+    db.execute("DELETE FROM metadata")
+    metadata = {
+        "name": os.path.splitext(os.path.basename(output_path))[0],
+        "format": "png",
+        "type": "overlay",
+        "minzoom": str(min_zoom),
+        "maxzoom": str(max_zoom),
+        "bounds": ",".join(f"{v:.6f}" for v in bounds),
+        "source": source,
+    }
+    db.executemany("INSERT INTO metadata VALUES (?, ?)", metadata.items())
+    db.commit()
+    return db
+
+def _lonlat_bounds(input_image):
+    input_ds = gdal.Open(input_image)
+    geotransform = input_ds.GetGeoTransform()
+    minx = geotransform[0]
+    maxy = geotransform[3]
+    maxx = minx + input_ds.RasterXSize * geotransform[1]
+    miny = maxy + input_ds.RasterYSize * geotransform[5]
+    input_ds = None
+
+    def to_lonlat(mx, my):
+        lon = mx / WEB_MERCATOR_ORIGIN * 180.0
+        lat = math.degrees(2 * math.atan(math.exp(my / WEB_MERCATOR_ORIGIN * math.pi)) - math.pi / 2)
+        return lon, lat
+
+    west, south = to_lonlat(minx, miny)
+    east, north = to_lonlat(maxx, maxy)
+    return west, south, east, north
+
+def _export_gpkg(input_image, output_path, min_zoom, max_zoom, processes=None):
+    # GeoPackage tiling is handled by GDAL's own driver; the stamp next to the
+    # .gpkg records what it was built from, like the .source file of xyz tiles
+    stamp_path = output_path + ".source"
+    source = f"{_source_signature(input_image)}|{min_zoom}-{max_zoom}"
+    if os.path.exists(output_path) and os.path.exists(stamp_path):
+        with open(stamp_path, "r", encoding="utf-8") as f:
+            if f.read().strip() == source:
+                print(f"{output_path} is up to date")
+                return
+
+    # the driver can't resume a partial pyramid, so start from scratch
+    for path in (output_path, stamp_path):
+        if os.path.exists(path):
+            os.remove(path)
+
+    # the GPKG driver and overview building use GDAL's own worker threads
+    gdal.SetConfigOption("GDAL_NUM_THREADS", str(processes) if processes else "ALL_CPUS")
+    try:
+        gdal.Translate(output_path, input_image, format="GPKG",
+                       creationOptions=["TILING_SCHEME=GoogleMapsCompatible",
+                                        f"ZOOM_LEVEL={max_zoom}", "TILE_FORMAT=PNG"])
+        output_ds = gdal.Open(output_path, gdal.GA_Update)
+        levels = [2 ** i for i in range(1, max_zoom - min_zoom + 1)]
+        if levels:
+            output_ds.BuildOverviews("AVERAGE", levels)
+        output_ds = None
+    finally:
+        gdal.SetConfigOption("GDAL_NUM_THREADS", None)
+
+    with open(stamp_path, "w", encoding="utf-8") as f:
+        f.write(source)
+
+@profiled("tiles")
+def export_tiles(input_image, output_path, min_zoom, max_zoom, tile_format="xyz", processes=None):
+    """Cuts an EPSG:3857 mosaic into a web tile pyramid.
+
+    Tiles are rendered in parallel and empty tiles are skipped. The output
+    records which mosaic (path, mtime, size) it was cut from and which tiles
+    were empty, so an interrupted export can simply be rerun; if the mosaic
+    changed since, the existing tiles are discarded first.
+
+    Args:
+        input_image (str): Path to the compressed EPSG:3857 mosaic.
+        output_path (str): Folder for "xyz", .mbtiles file for "mbtiles" or
+            .gpkg file for "gpkg".
+        min_zoom (int): Lowest zoom level to generate.
+        max_zoom (int): Highest zoom level to generate.
+        tile_format (str): "xyz", "mbtiles" or "gpkg".
+        processes (int): Number of worker processes (GDAL threads for
+            "gpkg"), defaults to all cores.
+    """
+    print("tiling")
+    if tile_format == "gpkg":
+        _export_gpkg(input_image, output_path, min_zoom, max_zoom, processes)
+        return
+    if tile_format not in ("xyz", "mbtiles"):
+        raise ValueError(f"Unsupported tile format: {tile_format}")
+
+    _build_overviews(input_image)
+
+    input_ds = gdal.Open(input_image)
+    geotransform = input_ds.GetGeoTransform()
+    xsize, ysize = input_ds.RasterXSize, input_ds.RasterYSize
+    input_ds = None
+
+    source = _source_signature(input_image)
+    db = None
+    empty_file = None
+    if tile_format == "mbtiles":
+        db = _open_mbtiles(output_path, min_zoom, max_zoom, _lonlat_bounds(input_image), source)
+        # MBTiles rows are stored bottom-up (TMS), flip them back to XYZ
+        done = {(z, x, 2 ** z - 1 - row) for z, x, row in
+                db.execute("SELECT zoom_level, tile_column, tile_row FROM tiles")}
+        empty = {(z, x, 2 ** z - 1 - row) for z, x, row in
+                 db.execute("SELECT zoom_level, tile_column, tile_row FROM empty_tiles")}
+    else:
+        empty = _open_xyz(output_path, source)
+        empty_file = open(os.path.join(output_path, ".empty"), "a", encoding="utf-8")
+
+    # only queue tiles that aren't in the output yet
+    pending = []
+    for z in range(min_zoom, max_zoom + 1):
+        x0, x1, y0, y1 = _tile_range(geotransform, xsize, ysize, z)
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                if (z, x, y) in empty:
+                    continue
+                if db is not None:
+                    if (z, x, y) in done:
+                        continue
+                elif os.path.exists(os.path.join(output_path, str(z), str(x), f"{y}.png")):
+                    continue
+                pending.append((z, x, y))
+    print(f"{len(pending)} tiles to render")
+
+    written = 0
+    processed = 0
+    with Pool(processes, initializer=_open_tile_source, initargs=(input_image,)) as pool:
+        for (z, x, y), png in pool.imap_unordered(_render_tile, pending, chunksize=16):
+            processed += 1
+            if db is not None and processed % 1000 == 0:
+                db.commit()
+            if png is None:
+                if db is not None:
+                    db.execute("INSERT OR IGNORE INTO empty_tiles VALUES (?, ?, ?)", (z, x, 2 ** z - 1 - y))
+                else:
+                    empty_file.write(f"{z}/{x}/{y}\n")
+                    empty_file.flush()
+                continue
+            if db is not None:
+                db.execute("INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)",
+                           (z, x, 2 ** z - 1 - y, sqlite3.Binary(png)))
+                written += 1
+            else:
+                tile_folder = os.path.join(output_path, str(z), str(x))
+                os.makedirs(tile_folder, exist_ok=True)
+                # write then rename so an interrupted run never leaves a partial tile
+                tile_path = os.path.join(tile_folder, f"{y}.png")
+                with open(tile_path + ".tmp", "wb") as f:
+                    f.write(png)
+                os.replace(tile_path + ".tmp", tile_path)
+                written += 1
+
+    if db is not None:
+        db.commit()
+        db.close()
+    else:
+        empty_file.close()
+    print(f"{written} tiles written")
+
+if __name__ == "__main__":
+    t1 = int(time.time())
+    #imagery folder
+    input_path = r"D:\Data\Mirpurkhas\1_raster_images\skywatch\raw"
+    #output folder
+    extracted_folder = r"D:\Data\Mirpurkhas\1_raster_images\skywatch\raw\4.0"
+    #rgb bands
+    bands = [6, 4, 2]
+    #brightness factor for final imagery
+    brightness_factor = 4.0
+
+    mosaic = extract_bands(input_path, extracted_folder, bands)
 
-mosaic = extract_bands(input_path, extracted_folder, bands)
+    # if mosaic:
+    mosaiced_image = os.path.join(extracted_folder, 'mosaiced.tif')
+    mosaicing(extracted_folder, mosaiced_image)
 
-# if mosaic:
-mosaiced_image = os.path.join(extracted_folder, 'mosaiced.tif')
-mosaicing(extracted_folder, mosaiced_image)
+    rescaled_image = os.path.join(extracted_folder, 'rescaled.tif')
+    rescale(mosaiced_image, rescaled_image, brightness_factor)
 
-rescaled_image = os.path.join(extracted_folder, 'rescaled.tif')
-rescale(mosaiced_image, rescaled_image, brightness_factor)
+    compressed_image = os.path.join(extracted_folder, 'compressed_4.0.tif')
+    compression(rescaled_image, compressed_image)
 
-compressed_image = os.path.join(extracted_folder, 'compressed_4.0.tif')
-compression(rescaled_image, compressed_image)
-t2 = int(time.time())
+    #web tiles for the dashboard
+    tiles_path = os.path.join(extracted_folder, 'tiles')
+    export_tiles(compressed_image, tiles_path, min_zoom=10, max_zoom=18)
+    t2 = int(time.time())
 
-print('Time taken: ', t2-t1, ' seconds')
+    print('Time taken: ', t2-t1, ' seconds')
@@ -0,0 +1,300 @@
+import hashlib
+import inspect
+import json
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from shapefile_parts import vector_file_parts
+
+# A pipeline command: the function to call and which of its arguments are
+# input and output paths (used to order stages and to skip up-to-date ones)
+Command = namedtuple("Command", ["handler", "inputs", "outputs"])
+
+
+def load_pipeline(config_path):
+    """Reads a pipeline file (.toml, .yaml or .yml).
+
+    The file holds a 'stages' table; each stage names a 'command', its 'args'
+    and optionally the stages it 'depends_on' besides the ones inferred from
+    matching input and output paths:
+
+        [stages.mosaic]
+        command = "mosaic"
+        args = { img_folder = "D:/raw/extracted", output_raster = "D:/raw/mosaic.tif" }
+
+    Args:
+        config_path (str): Path to the pipeline file.
+
+    Returns:
+        dict: Stage name -> stage definition.
+    """
+    extension = os.path.splitext(config_path)[1].lower()
+    if extension == ".toml":
+        import tomllib
+
+        with open(config_path, "rb") as f:
+            config = tomllib.load(f)
+    elif extension in (".yaml", ".yml"):
+        import yaml
+
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f)
+    else:
+        raise ValueError(f"Unsupported pipeline file: {config_path} (use .toml, .yaml or .yml)")
+
+    stages = (config or {}).get("stages")
+    if not stages:
+        raise ValueError(f"No stages defined in {config_path}")
+    return stages
+
+
+def _normalize(path):
+    return os.path.normcase(os.path.abspath(os.path.expanduser(str(path))))
+
+
+def _stage_paths(stage, keys):
+    paths = []
+    for key in keys:
+        value = stage.get("args", {}).get(key)
+        if value:
+            paths.append(_normalize(value))
+    return paths
+
+
+def _overlaps(a, b):
+    # A path overlaps another if they are equal or one is inside the other (folders)
+    return a == b or a.startswith(b + os.sep) or b.startswith(a + os.sep)
+
+
+def build_graph(stages, commands):
+    """Returns stage name -> set of stage names it depends on.
+
+    Raises:
+        ValueError: For unknown commands or dependencies, or dependency cycles.
+    """
+    for name, stage in stages.items():
+        if stage.get("command") not in commands:
+            raise ValueError(f"Stage '{name}' uses unknown command '{stage.get('command')}'")
+
+    outputs = {name: _stage_paths(stage, commands[stage["command"]].outputs) for name, stage in stages.items()}
+    graph = {}
+    for name, stage in stages.items():
+        depends_on = set(stage.get("depends_on", []))
+        unknown = depends_on - set(stages)
+        if unknown:
+            raise ValueError(f"Stage '{name}' depends on unknown stage(s): {', '.join(sorted(unknown))}")
+
+        # Stages that write a path this stage reads from come first
+        for input_path in _stage_paths(stage, commands[stage["command"]].inputs):
+            for other, other_outputs in outputs.items():
+                if other != name and any(_overlaps(input_path, o) for o in other_outputs):
+                    depends_on.add(other)
+        graph[name] = depends_on
+
+    # Reject cycles
+    visiting, visited = set(), set()
+
+    def visit(name):
+        if name in visited:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle through stage '{name}'")
+        visiting.add(name)
+        for dependency in graph[name]:
+            visit(dependency)
+        visiting.discard(name)
+        visited.add(name)
+
+    for name in graph:
+        visit(name)
+    return graph
+
+
+def _file_hash(path, state):
+    """Content hash of a file, reused from the state while size and mtime are unchanged."""
+    stat = os.stat(path)
+    cached = state["files"].get(path)
+    if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+        return cached[2]
+
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha1.update(chunk)
+    digest = sha1.hexdigest()
+    state["files"][path] = [stat.st_size, stat.st_mtime_ns, digest]
+    return digest
+
+
+def _path_hash(path, state, exclude=()):
+    if os.path.isdir(path):
+        sha1 = hashlib.sha1()
+        for root, dirs, files in os.walk(path):
+            # Skip the stage's own outputs when they live inside its input folder
+            dirs[:] = sorted(d for d in dirs if not any(_overlaps(os.path.join(root, d), e) for e in exclude))
+            for file in sorted(files):
+                file_path = os.path.join(root, file)
+                if any(_overlaps(file_path, e) for e in exclude):
+                    continue
+                sha1.update(os.path.relpath(file_path, path).encode("utf-8"))
+                sha1.update(_file_hash(file_path, state).encode("utf-8"))
+        return sha1.hexdigest()
+    if not os.path.exists(path):
+        return None
+    parts = vector_file_parts(path)
+    if len(parts) == 1:
+        return _file_hash(path, state)
+
+    # A shapefile is the .shp plus its sidecar files
+    sha1 = hashlib.sha1(_file_hash(path, state).encode("utf-8"))
+    for part in parts[1:]:
+        sha1.update(os.path.splitext(part)[1].lower().encode("utf-8"))
+        sha1.update(_file_hash(part, state).encode("utf-8"))
+    return sha1.hexdigest()
+
+
+def _stage_signature(stage, command, state):
+    outputs = _stage_paths(stage, command.outputs)
+    inputs = {path: _path_hash(path, state, outputs) for path in _stage_paths(stage, command.inputs)}
+    payload = json.dumps({"command": stage["command"], "args": stage.get("args", {}), "inputs": inputs},
+                         sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _is_up_to_date(name, stage, command, signature, state):
+    outputs = _stage_paths(stage, command.outputs)
+    # Stages without declared outputs (e.g. in-place edits) always run
+    if not outputs or not all(os.path.exists(path) for path in outputs):
+        return False
+    return state["stages"].get(name) == signature
+
+
+def _load_state(state_path):
+    if os.path.exists(state_path):
+        try:
+            with open(state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            state.setdefault("files", {})
+            state.setdefault("stages", {})
+            return state
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable pipeline state {state_path}: {e}")
+    return {"files": {}, "stages": {}}
+
+
+def _save_state(state_path, state):
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, state_path)
+
+
+def _run_stage(handler, args):
+    handler(**args)
+
+
+def run_pipeline(config_path, commands, workers=None, force=False, dry_run=False):
+    """Runs the stages of a pipeline file, independent stages concurrently.
+
+    Like make, a stage is skipped when its outputs exist and neither its
+    arguments nor the content of its inputs changed since its last successful
+    run. Input hashes are only recomputed for files whose size or
+    modification time changed. The state is kept next to the pipeline file.
+    Stages depending on a failed stage are not run. Commands with their own
+    worker pool (a 'processes' argument, e.g. tiles and change) get
+    cores / workers processes each, unless the stage sets 'processes'.
+
+    Args:
+        config_path (str): Path to the pipeline file.
+        commands (dict): Command name -> Command.
+        workers (int): Maximum number of stages running at once, defaults to
+            the number of cores.
+        force (bool): Run every stage even if it is up to date.
+        dry_run (bool): Only print which stages would run, counting every
+            stage downstream of one that would run.
+
+    Returns:
+        bool: True if every stage succeeded or was up to date.
+    """
+    start_time = time.time()
+    stages = load_pipeline(config_path)
+    graph = build_graph(stages, commands)
+    state_path = os.path.join(os.path.dirname(os.path.abspath(config_path)),
+                              f".{os.path.basename(config_path)}.state.json")
+    state = _load_state(state_path)
+
+    # Share the cores between concurrent stages instead of nesting full-size pools
+    workers = workers or os.cpu_count() or 1
+    stage_processes = max(1, (os.cpu_count() or 1) // workers)
+
+    pending = set(stages)
+    done, failed = set(), set()
+    # Stages a dry run would run; what depends on them would run too
+    would_run = set()
+    running = {}
+
+    with ProcessPoolExecutor(workers) as executor:
+        while pending or running:
+            # Start (or skip) every stage whose dependencies have finished
+            progressed = True
+            while progressed:
+                progressed = False
+                for name in sorted(pending):
+                    if graph[name] & failed:
+                        print(f"[{name}] not run, a dependency failed")
+                        pending.discard(name)
+                        failed.add(name)
+                        progressed = True
+                        continue
+                    if not graph[name] <= done:
+                        continue
+
+                    pending.discard(name)
+                    progressed = True
+                    stage = stages[name]
+                    command = commands[stage["command"]]
+                    signature = _stage_signature(stage, command, state)
+                    if not force and not graph[name] & would_run and \
+                            _is_up_to_date(name, stage, command, signature, state):
+                        print(f"[{name}] up to date")
+                        done.add(name)
+                        continue
+                    if dry_run:
+                        print(f"[{name}] would run {stage['command']}")
+                        would_run.add(name)
+                        done.add(name)
+                        continue
+
+                    args = dict(stage.get("args", {}))
+                    if "processes" in inspect.signature(command.handler).parameters and \
+                            args.get("processes") is None:
+                        args["processes"] = stage_processes
+                    print(f"[{name}] running {stage['command']}")
+                    future = executor.submit(_run_stage, command.handler, args)
+                    running[future] = (name, signature, time.time())
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, signature, stage_start = running.pop(future)
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"[{name}] failed: {e}")
+                    failed.add(name)
+                    state["stages"].pop(name, None)
+                else:
+                    print(f"[{name}] finished in {time.time() - stage_start:.1f} seconds")
+                    done.add(name)
+                    state["stages"][name] = signature
+                if not dry_run:
+                    _save_state(state_path, state)
+
+    if not dry_run:
+        _save_state(state_path, state)
+    print(f"Pipeline finished in {time.time() - start_time:.1f} seconds: "
+          f"{len(done)} done, {len(failed)} failed")
+    return not failed
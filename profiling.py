@@ -0,0 +1,142 @@
+import functools
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+# Set this to a .jsonl path to record the metrics of every stage run in production
+PROFILE_ENV = "DATA_STANDARDIZATION_PROFILE"
+
+# Extra receivers of stage metrics (used by benchmark.py)
+_sinks = []
+
+
+def add_sink(sink):
+    """Registers a callable that receives the metrics dict of every profiled stage."""
+    _sinks.append(sink)
+
+
+def remove_sink(sink):
+    _sinks.remove(sink)
+
+
+def _io_bytes():
+    """Bytes read and written by this process so far, or (None, None) if unknown."""
+    try:
+        # Linux: rchar/wchar count every read()/write(), cached or not
+        counters = {}
+        with open("/proc/self/io", "r") as f:
+            for line in f:
+                key, value = line.split(":")
+                counters[key] = int(value)
+        return counters["rchar"], counters["wchar"]
+    except (OSError, KeyError, ValueError):
+        pass
+    try:
+        import psutil
+
+        counters = psutil.Process().io_counters()
+        return counters.read_bytes, counters.write_bytes
+    except Exception:
+        return None, None
+
+
+def _reset_peak_rss():
+    # Linux lets a process reset its peak RSS, so the peak is per stage
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_bytes():
+    """Peak resident memory of this process (since the last reset on Linux)."""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    try:
+        # macOS and other Unixes: lifetime peak, in bytes on macOS and KB elsewhere
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        pass
+    try:
+        # Windows has no resource module, psutil reports the peak working set
+        import psutil
+
+        return psutil.Process().memory_info().peak_wset
+    except Exception:
+        return None
+
+
+def _emit(metrics):
+    profile_path = os.environ.get(PROFILE_ENV)
+    if profile_path:
+        try:
+            with open(profile_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(metrics) + "\n")
+        except OSError as e:
+            print(f"Could not write stage metrics to {profile_path}: {e}")
+    for sink in list(_sinks):
+        sink(metrics)
+
+
+def profiled(stage):
+    """Decorator recording wall time, peak RSS and bytes read/written of a stage.
+
+    Profiling is opt-in: nothing is measured unless the
+    DATA_STANDARDIZATION_PROFILE environment variable points to a .jsonl file
+    or a sink was registered with add_sink(). Work done in child processes
+    (e.g. tile rendering workers) is not included in the memory and I/O
+    numbers.
+
+    Args:
+        stage (str): Stage name reported in the metrics.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _sinks and not os.environ.get(PROFILE_ENV):
+                return func(*args, **kwargs)
+
+            _reset_peak_rss()
+            started_at = datetime.now().isoformat(timespec="seconds")
+            read_before, written_before = _io_bytes()
+            start_time = time.perf_counter()
+            status = "ok"
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                status = "error"
+                raise
+            finally:
+                wall_time = time.perf_counter() - start_time
+                read_after, written_after = _io_bytes()
+                bytes_read = None if read_before is None else read_after - read_before
+                bytes_written = None if written_before is None else written_after - written_before
+                peak_rss = _peak_rss_bytes()
+                _emit({
+                    "stage": stage,
+                    "function": f"{func.__module__}.{func.__name__}",
+                    "status": status,
+                    "started_at": started_at,
+                    "pid": os.getpid(),
+                    "wall_time_s": round(wall_time, 4),
+                    "peak_rss_mb": None if peak_rss is None else round(peak_rss / 1024 ** 2, 2),
+                    "bytes_read": bytes_read,
+                    "bytes_written": bytes_written,
+                    "read_mb_per_s": None if bytes_read is None or wall_time == 0
+                    else round(bytes_read / 1024 ** 2 / wall_time, 2),
+                    "written_mb_per_s": None if bytes_written is None or wall_time == 0
+                    else round(bytes_written / 1024 ** 2 / wall_time, 2),
+                })
+        return wrapper
+    return decorator
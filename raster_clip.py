@@ -1,18 +1,21 @@
 import rasterio
 from rasterio.mask import mask
-import geopandas as gpd
+from profiling import profiled
+from vector_io import read_vector
 
+@profiled("clip")
 def clip_raster(raster_path, mask_shapefile_path, output_path):
     """Clips a raster file using a vector mask layer.
 
     Args:
         raster_path (str): Path to the input raster file.
-        mask_shapefile_path (str): Path to the vector mask shapefile.
+        mask_shapefile_path (str): Path to the vector mask (.shp, .parquet,
+            .fgb, ...).
         output_path (str): Path to save the clipped raster output.
     """
 
     # Read the mask shapefile
-    mask_gdf = gpd.read_file(mask_shapefile_path)
+    mask_gdf = read_vector(mask_shapefile_path)
 
     # Open the raster file and get geospatial metadata
     with rasterio.open(raster_path) as src:
@@ -33,9 +36,10 @@ def clip_raster(raster_path, mask_shapefile_path, output_path):
         dest.write(out_image)
 
 
-# Example usage
-raster_path = r"D:\test_del\fsml_2024-02-07.tif"
-mask_shapefile_path = r"D:\test_del\fsml_sugarcane.shp"
-output_path = r"D:\test_del\fsml_2024-02-07_sugarcane_clip.tif"
+if __name__ == "__main__":
+    # Example usage
+    raster_path = r"D:\test_del\fsml_2024-02-07.tif"
+    mask_shapefile_path = r"D:\test_del\fsml_sugarcane.shp"
+    output_path = r"D:\test_del\fsml_2024-02-07_sugarcane_clip.tif"
 
-clip_raster(raster_path, mask_shapefile_path, output_path)
\ No newline at end of file
+    clip_raster(raster_path, mask_shapefile_path, output_path)
\ No newline at end of file
@@ -1,43 +1,52 @@
-import geopandas as gpd
+from area_cache import load_area_layer
+from profiling import profiled
 
 # Define the source CRS (default) and the target CRS (UTM Zone 42N)
 default_crs = "EPSG:4326"  # WGS 84 (Lat/Long)
 utm_42n_crs = "EPSG:32642"  # UTM Zone 42N (meters)
 
-# Load the first shapefile (default CRS 4326)
-shapefile1 = gpd.read_file(r"D:\5) Corteva Agriscience\9) Corteva Fall Maize Classification 2021\raw\corteva_fall_maize_sowing_2021_results_raw_week-wise_clip_aoi_dissolve_new-week_intersect.shp")
-
-# Load the second shapefile (default CRS 4326)
-shapefile2 = gpd.read_file(r"D:\5) Corteva Agriscience\9) Corteva Fall Maize Classification 2021\raw\corteva_fall_maize_sowing_2021_results_raw_week-wise_clip_aoi_dissolve_new-week_intersect.shp")
-
-# Ensure both shapefiles are in the same CRS (default 4326)
-shapefile1 = shapefile1.set_crs(default_crs)
-shapefile2 = shapefile2.set_crs(default_crs)
-
-# Reproject both shapefiles to UTM Zone 42N
-shapefile1 = shapefile1.to_crs(utm_42n_crs)
-shapefile2 = shapefile2.to_crs(utm_42n_crs)
-
-# Calculate the area in square meters (since UTM coordinates are in meters)
-shapefile1['area_sqm'] = shapefile1.geometry.area
-shapefile2['area_sqm'] = shapefile2.geometry.area
-
-# Convert square meters to acres (1 acre = 4046.86 square meters)
-shapefile1['area_acres'] = shapefile1['area_sqm'] / 4046.86
-shapefile2['area_acres'] = shapefile2['area_sqm'] / 4046.86
-
-# Sum the total area of each shapefile
-total_area1_acres = shapefile1['area_acres'].sum()
-total_area2_acres = shapefile2['area_acres'].sum()
-
-# Print the results
-print(f"Total area of shapefile 1: {total_area1_acres:.2f} acres")
-print(f"Total area of shapefile 2: {total_area2_acres:.2f} acres")
-
-# Compare the areas
-if total_area1_acres > total_area2_acres:
-    print(f"Shapefile 1 is larger by {total_area1_acres - total_area2_acres:.2f} acres.")
-elif total_area2_acres > total_area1_acres:
-    print(f"Shapefile 2 is larger by {total_area2_acres - total_area1_acres:.2f} acres.")
-else:
-    print("Both shapefiles have the same area.")
+@profiled("area")
+def compare_areas(shapefile1_path, shapefile2_path, source_crs=default_crs, target_crs=utm_42n_crs):
+    """Compares the total area in acres of two shapefiles.
+
+    Args:
+        shapefile1_path (str): Path to the first shapefile.
+        shapefile2_path (str): Path to the second shapefile.
+        source_crs (str): CRS assigned to both shapefiles before reprojecting.
+        target_crs (str): Projected CRS (in meters) to compute areas in.
+
+    Returns:
+        tuple: Total area of shapefile 1 and shapefile 2 in acres.
+    """
+    # Load both shapefiles in the source CRS, reprojected to the target CRS with
+    # 'area_sqm' and 'area_acres' columns. Layers are cached by path and
+    # modification time, so the same file is only read and projected once.
+    shapefile1 = load_area_layer(shapefile1_path, target_crs, source_crs)
+    shapefile2 = load_area_layer(shapefile2_path, target_crs, source_crs)
+
+    # Sum the total area of each shapefile
+    total_area1_acres = shapefile1['area_acres'].sum()
+    total_area2_acres = shapefile2['area_acres'].sum()
+
+    # Print the results
+    print(f"Total area of shapefile 1: {total_area1_acres:.2f} acres")
+    print(f"Total area of shapefile 2: {total_area2_acres:.2f} acres")
+
+    # Compare the areas
+    if total_area1_acres > total_area2_acres:
+        print(f"Shapefile 1 is larger by {total_area1_acres - total_area2_acres:.2f} acres.")
+    elif total_area2_acres > total_area1_acres:
+        print(f"Shapefile 2 is larger by {total_area2_acres - total_area1_acres:.2f} acres.")
+    else:
+        print("Both shapefiles have the same area.")
+
+    return total_area1_acres, total_area2_acres
+
+if __name__ == "__main__":
+    # Path of the first shapefile
+    shapefile1_path = r"D:\5) Corteva Agriscience\9) Corteva Fall Maize Classification 2021\raw\corteva_fall_maize_sowing_2021_results_raw_week-wise_clip_aoi_dissolve_new-week_intersect.shp"
+
+    # Path of the second shapefile
+    shapefile2_path = r"D:\5) Corteva Agriscience\9) Corteva Fall Maize Classification 2021\raw\corteva_fall_maize_sowing_2021_results_raw_week-wise_clip_aoi_dissolve_new-week_intersect.shp"
+
+    compare_areas(shapefile1_path, shapefile2_path)
@@ -1,12 +1,28 @@
 import geopandas as gpd
+from vector_io import read_vector, write_vector
+from profiling import profiled
 
-# Load the main shapefile (the one you want to clip)
-main_shapefile = gpd.read_file(r"D:\Data_Migration_IQ_Dashboard\22_Shahmurad_Data\1_Boundaries\Shahmurad_gates_optimize.shp")
-# Load the clipping shapefile
-clip_shapefile = gpd.read_file(r"D:\Data_Migration_IQ_Dashboard\22_Shahmurad_Data\1_Boundaries\Shahmurad .geojson")
+@profiled("clip")
+def clip_shapefile(input_path, clip_path, output_path):
+    """Clips vector features to the polygons of a boundary layer.
 
-# Perform the clip operation
-clipped_shapefile = gpd.overlay(main_shapefile, clip_shapefile, how='intersection')
+    Args:
+        input_path (str): Path to the layer to clip.
+        clip_path (str): Path to the boundary layer.
+        output_path (str): Path to save the clipped layer.
+    """
+    # Load the main shapefile (the one you want to clip)
+    main_shapefile = read_vector(input_path)
+    # Load the clipping shapefile
+    clip_shapefile = read_vector(clip_path)
 
-# Save the result to a new shapefile
-clipped_shapefile.to_file(r"D:\Data_Migration_IQ_Dashboard\22_Shahmurad_Data\1_Boundaries\Shahmurad_gates_optimize_clip.shp")
\ No newline at end of file
+    # Perform the clip operation
+    clipped_shapefile = gpd.overlay(main_shapefile, clip_shapefile, how='intersection')
+
+    # Save the result (.shp, .parquet or .fgb by extension)
+    write_vector(clipped_shapefile, output_path)
+
+if __name__ == "__main__":
+    clip_shapefile(r"D:\Data_Migration_IQ_Dashboard\22_Shahmurad_Data\1_Boundaries\Shahmurad_gates_optimize.shp",
+                   r"D:\Data_Migration_IQ_Dashboard\22_Shahmurad_Data\1_Boundaries\Shahmurad .geojson",
+                   r"D:\Data_Migration_IQ_Dashboard\22_Shahmurad_Data\1_Boundaries\Shahmurad_gates_optimize_clip.shp")
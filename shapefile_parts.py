@@ -0,0 +1,27 @@
+import os
+
+# Files that belong to a .shp; attribute edits only touch the .dbf
+SHAPEFILE_SIDECAR_EXTENSIONS = (".shx", ".dbf", ".prj", ".cpg")
+
+
+def vector_file_parts(path):
+    """Returns the path plus, for a shapefile, its existing sidecar files.
+
+    Only needs the standard library, so it can be used to fingerprint inputs
+    (pipeline.py) without importing geopandas.
+
+    Args:
+        path (str): Path to a vector file.
+
+    Returns:
+        list: The path followed by the sidecar files found next to it.
+    """
+    parts = [path]
+    if os.path.splitext(str(path))[1].lower() == ".shp":
+        base = os.path.splitext(str(path))[0]
+        for sidecar in SHAPEFILE_SIDECAR_EXTENSIONS:
+            for candidate in (base + sidecar, base + sidecar.upper()):
+                if os.path.exists(candidate):
+                    parts.append(candidate)
+                    break
+    return parts
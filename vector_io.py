@@ -0,0 +1,171 @@
+import importlib.util
+import json
+import os
+import geopandas as gpd
+from profiling import profiled
+from shapefile_parts import SHAPEFILE_SIDECAR_EXTENSIONS, vector_file_parts
+
+# Vector formats the scripts can read and write, chosen by file extension
+PARQUET_EXTENSIONS = (".parquet", ".geoparquet")
+FLATGEOBUF_EXTENSIONS = (".fgb",)
+SHAPEFILE_EXTENSIONS = (".shp",)
+VECTOR_EXTENSIONS = SHAPEFILE_EXTENSIONS + PARQUET_EXTENSIONS + FLATGEOBUF_EXTENSIONS + (".geojson", ".gpkg")
+
+# pyogrio can only hand features over as Arrow when pyarrow is installed
+USE_ARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+def _extension(path):
+    return os.path.splitext(str(path))[1].lower()
+
+
+def is_vector_file(path):
+    """Returns True if the path has one of the supported vector extensions."""
+    return _extension(path) in VECTOR_EXTENSIONS
+
+
+def _has_bbox_covering(path):
+    """Returns True if a GeoParquet file has a bbox covering column to filter on."""
+    import pyarrow.parquet as pq
+
+    metadata = pq.read_schema(path).metadata or {}
+    try:
+        geo = json.loads(metadata[b"geo"])
+        return "covering" in geo["columns"][geo["primary_column"]]
+    except (KeyError, ValueError):
+        return False
+
+
+def _batch_to_geodataframe(batch, geometry_column, crs):
+    # Geometries arrive as WKB, decode them with shapely in one vectorized call
+    geometry = gpd.GeoSeries.from_wkb(batch.column(geometry_column).to_numpy(zero_copy_only=False), crs=crs)
+    attributes = batch.drop_columns([geometry_column]).to_pandas()
+    return gpd.GeoDataFrame(attributes, geometry=geometry.values, crs=crs)
+
+
+def read_vector(path, columns=None, bbox=None):
+    """Reads a vector layer, picking the reader from the file extension.
+
+    GeoParquet is read through pyarrow, everything else through pyogrio with
+    Arrow transport (when pyarrow is installed), which avoids the
+    per-feature Python overhead of Fiona.
+
+    Args:
+        path (str): Path to a .shp, .parquet, .fgb, .geojson or .gpkg file,
+            or a zipped shapefile (.zip).
+        columns (list): Optional subset of attribute columns to load.
+        bbox (tuple): Optional (minx, miny, maxx, maxy) spatial filter in
+            the layer CRS. FlatGeobuf uses its spatial index and GeoParquet
+            the bbox covering column written by write_vector(), if present.
+
+    Returns:
+        GeoDataFrame: The loaded layer.
+    """
+    extension = _extension(path)
+    if extension in PARQUET_EXTENSIONS:
+        read_columns = None if columns is None else list(columns) + ["geometry"]
+        if bbox is None or _has_bbox_covering(path):
+            return gpd.read_parquet(path, columns=read_columns, bbox=bbox)
+        # Files from other tools may lack the covering column, filter after reading
+        gdf = gpd.read_parquet(path, columns=read_columns)
+        return gdf.cx[bbox[0]:bbox[2], bbox[1]:bbox[3]]
+
+    if extension == ".zip":
+        path = f"zip://{path}"
+    return gpd.read_file(path, columns=columns, bbox=bbox, engine="pyogrio", use_arrow=USE_ARROW)
+
+
+def write_vector(gdf, path):
+    """Writes a vector layer, picking the writer from the file extension.
+
+    Args:
+        gdf (GeoDataFrame): Layer to write.
+        path (str): Output path. .parquet/.geoparquet writes GeoParquet,
+            .fgb writes FlatGeobuf with a spatial index, anything else is
+            handed to OGR (Shapefile, GeoJSON, GeoPackage).
+    """
+    extension = _extension(path)
+    if extension in PARQUET_EXTENSIONS:
+        gdf.to_parquet(path, compression="zstd", write_covering_bbox=True)
+    elif extension in FLATGEOBUF_EXTENSIONS:
+        gdf.to_file(path, driver="FlatGeobuf", engine="pyogrio", SPATIAL_INDEX="YES")
+    else:
+        gdf.to_file(path, engine="pyogrio")
+
+
+def iter_vector_batches(path, batch_size=65536, columns=None):
+    """Yields a large vector layer as GeoDataFrames of at most batch_size rows.
+
+    Uses Arrow-based batched I/O, so only one batch is held in memory at a
+    time. Requires pyarrow.
+
+    Args:
+        path (str): Path to any supported vector file.
+        batch_size (int): Maximum number of features per batch.
+        columns (list): Optional subset of attribute columns to load.
+
+    Yields:
+        GeoDataFrame: The next batch of features.
+    """
+    if _extension(path) in PARQUET_EXTENSIONS:
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        geo = json.loads(parquet_file.schema_arrow.metadata[b"geo"])
+        geometry_column = geo["primary_column"]
+        crs = geo["columns"][geometry_column].get("crs", "OGC:CRS84")
+        if columns is None:
+            # Leave out the bbox covering column write_vector() adds
+            covering = geo["columns"][geometry_column].get("covering", {}).get("bbox", {})
+            skip = {field[0] for field in covering.values()}
+            columns = [name for name in parquet_file.schema_arrow.names if name not in skip | {geometry_column}]
+        read_columns = list(columns) + [geometry_column]
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=read_columns):
+            yield _batch_to_geodataframe(batch, geometry_column, crs)
+        return
+
+    from pyogrio.raw import open_arrow
+
+    if _extension(path) == ".zip":
+        path = f"zip://{path}"
+    with open_arrow(path, columns=columns, batch_size=batch_size, use_pyarrow=True) as (meta, reader):
+        geometry_column = meta["geometry_name"] or "wkb"
+        for batch in reader:
+            yield _batch_to_geodataframe(batch, geometry_column, meta["crs"])
+
+
+@profiled("convert")
+def convert_vector_archive(input_folder, output_folder, extension=".parquet"):
+    """Converts every shapefile (plain or zipped) in a folder to another format.
+
+    Args:
+        input_folder (str): Folder containing .shp files and/or zipped shapefiles.
+        output_folder (str): Folder to write the converted layers to.
+        extension (str): Output format extension, ".parquet" or ".fgb".
+    """
+    os.makedirs(output_folder, exist_ok=True)
+
+    for file in os.listdir(input_folder):
+        if not file.lower().endswith((".shp", ".zip")):
+            continue
+        file_path = os.path.join(input_folder, file)
+        output_path = os.path.join(output_folder, os.path.splitext(file)[0] + extension)
+
+        # Skip layers that were already converted and haven't changed since
+        if os.path.exists(output_path) and os.path.getmtime(output_path) >= os.path.getmtime(file_path):
+            print(f"Up to date: {output_path}")
+            continue
+
+        try:
+            write_vector(read_vector(file_path), output_path)
+            print(f"Converted: {file} -> {output_path}")
+        except Exception as e:
+            print(f"Error converting {file}: {e}")
+
+
+if __name__ == "__main__":
+    # Example usage
+    input_folder = r"D:\Data_Migration_IQ_Dashboard\1_Corteva_Data"  # Folder with shapefiles / zipped shapefiles
+    output_folder = r"D:\Data_Migration_IQ_Dashboard\1_Corteva_Data\parquet"  # Folder for converted layers
+
+    convert_vector_archive(input_folder, output_folder, ".parquet")
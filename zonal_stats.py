@@ -0,0 +1,207 @@
+import math
+import os
+import numpy as np
+import pandas as pd
+import rasterio
+from pyproj import CRS, Transformer
+from rasterio import features, windows
+from area_cache import SQM_PER_ACRE
+from profiling import profiled
+from vector_io import read_vector
+
+
+def _is_mercator(projection):
+    operation = projection.coordinate_operation
+    if operation is None:
+        return False
+    method = operation.method_name.lower()
+    # Transverse (UTM) and oblique Mercator keep areas close to true locally
+    return "mercator" in method and "transverse" not in method and "oblique" not in method
+
+
+def _row_pixel_areas(transform, crs, row_off, height):
+    """Ground area in square meters of one pixel for each raster row.
+
+    Geographic and Mercator (e.g. EPSG:3857 mosaics) pixels cover less ground
+    the further they are from the equator, so their area is measured on the
+    ellipsoid per row. Other projected CRSs use the nominal pixel area.
+    """
+    projection = CRS.from_user_input(crs.to_wkt()) if crs is not None else None
+    if projection is None or (not projection.is_geographic and not _is_mercator(projection)):
+        return np.full(height, abs(transform.a * transform.e))
+
+    # Corners of the first pixel of each row, as lon/lat; the area doesn't vary along a row
+    top = transform.f + (row_off + np.arange(height)) * transform.e
+    bottom = top + transform.e
+    left = np.full(height, transform.c)
+    right = left + transform.a
+    to_lonlat = Transformer.from_crs(projection, projection.geodetic_crs, always_xy=True)
+    lon_left, lat_top = to_lonlat.transform(left, top)
+    lon_right, lat_bottom = to_lonlat.transform(right, bottom)
+
+    geod = projection.get_geod()
+    areas = np.empty(height)
+    for i in range(height):
+        area, _ = geod.polygon_area_perimeter(
+            [lon_left[i], lon_right[i], lon_right[i], lon_left[i]],
+            [lat_top[i], lat_top[i], lat_bottom[i], lat_bottom[i]])
+        areas[i] = abs(area)
+    return areas
+
+
+@profiled("zonal")
+def zonal_statistics(raster_path, zones_path, output_path, zone_field=None, band=1, categorical=None,
+                     classes=None):
+    """Summarizes raster values per boundary polygon without clipping to disk.
+
+    The polygons are rasterized once onto the raster grid, then the raster is
+    read block by block and per-zone counts, sums, acres and (for categorical
+    rasters) per-class acres are accumulated with np.bincount, the per-class
+    acres with a single bincount over (zone, class) pairs of a fixed class set.
+
+    Acres are ground areas: for geographic and Mercator rasters, whose
+    pixel areas vary with latitude, each row's pixel area is measured on the
+    ellipsoid.
+
+    Args:
+        raster_path (str): Path to the input raster.
+        zones_path (str): Path to the boundary polygons (deh, farm, ...).
+        output_path (str): Path for the result table (.csv or .parquet).
+        zone_field (str): Column identifying each zone, defaults to the
+            feature index.
+        band (int): Raster band to summarize.
+        categorical (bool): Also report acres per raster value (class). Only
+            integer rasters are categorical; defaults to True for 8 bit
+            rasters and when classes are given.
+        classes (list): Class values to report, required for categorical
+            rasters wider than 8 bit. Defaults to every 8 bit value that
+            occurs in the zones.
+
+    Returns:
+        DataFrame: One row per zone with 'pixel_count', 'sum', 'mean',
+            'area_acres' and, if categorical, 'class_<value>_acres' columns.
+
+    Raises:
+        ValueError: If categorical is requested for a floating point raster,
+            or for a raster wider than 8 bit without classes.
+    """
+    zones = read_vector(zones_path).reset_index(drop=True)
+    zone_ids = zones[zone_field] if zone_field else pd.Series(zones.index, name="zone")
+    zone_count = len(zones)
+
+    with rasterio.open(raster_path) as src:
+        dtype = np.dtype(src.dtypes[band - 1])
+        is_byte = np.issubdtype(dtype, np.integer) and dtype.itemsize == 1
+        if categorical is None:
+            categorical = is_byte or classes is not None
+        if categorical and not np.issubdtype(dtype, np.integer):
+            raise ValueError(f"{dtype} rasters have no classes, summarize them with categorical=False.")
+        if categorical and classes is None and not is_byte:
+            raise ValueError(f"Pass the class values to report for {dtype} rasters.")
+
+        if zones.crs is not None and src.crs is not None and zones.crs != src.crs:
+            zones = zones.to_crs(src.crs)
+
+        # Only the part of the raster covered by the zones is rasterized and read
+        full_window = windows.Window(0, 0, src.width, src.height)
+        bounds_window = windows.from_bounds(*zones.total_bounds, transform=src.transform)
+        col_off = math.floor(bounds_window.col_off)
+        row_off = math.floor(bounds_window.row_off)
+        zones_window = windows.Window(col_off, row_off,
+                                      math.ceil(bounds_window.col_off + bounds_window.width) - col_off,
+                                      math.ceil(bounds_window.row_off + bounds_window.height) - row_off)
+        if not windows.intersect(zones_window, full_window):
+            raise ValueError("The zones do not overlap the raster.")
+        zones_window = zones_window.intersection(full_window)
+
+        # Zone 0 marks pixels outside every polygon
+        zone_grid = features.rasterize(
+            ((geom, i + 1) for i, geom in enumerate(zones.geometry) if geom is not None and not geom.is_empty),
+            out_shape=(int(zones_window.height), int(zones_window.width)),
+            transform=windows.transform(zones_window, src.transform),
+            fill=0,
+            dtype="uint32",
+        )
+
+        # Pixel area per row of the zones window, computed once
+        row_areas = _row_pixel_areas(src.transform, src.crs, int(zones_window.row_off), int(zones_window.height))
+
+        bins = zone_count + 1
+        pixel_count = np.zeros(bins, dtype=np.int64)
+        value_sum = np.zeros(bins, dtype=np.float64)
+        area_sqm = np.zeros(bins, dtype=np.float64)
+        if categorical:
+            # Fixed class set, each (zone, class) pair gets its own bincount bin
+            if classes is None:
+                class_values = np.arange(np.iinfo(dtype).min, np.iinfo(dtype).max + 1)
+            else:
+                class_values = np.unique(np.asarray(classes, dtype=np.int64))
+            class_count = len(class_values)
+            class_area_sqm = np.zeros(bins * class_count, dtype=np.float64)
+
+        for _, block in src.block_windows(band):
+            if not windows.intersect(block, zones_window):
+                continue
+            block = block.intersection(zones_window)
+            row = int(block.row_off - zones_window.row_off)
+            col = int(block.col_off - zones_window.col_off)
+            zone_block = zone_grid[row:row + int(block.height), col:col + int(block.width)]
+            if not zone_block.any():
+                continue
+
+            values = src.read(band, window=block)
+            valid = zone_block > 0
+            if src.nodata is not None:
+                valid &= values != src.nodata
+            if np.issubdtype(values.dtype, np.floating):
+                valid &= ~np.isnan(values)
+
+            pixel_areas = np.broadcast_to(row_areas[row:row + int(block.height), None], values.shape)
+
+            block_zones = zone_block[valid]
+            block_values = values[valid]
+            block_areas = pixel_areas[valid]
+
+            pixel_count += np.bincount(block_zones, minlength=bins)
+            value_sum += np.bincount(block_zones, weights=block_values.astype(np.float64), minlength=bins)
+            area_sqm += np.bincount(block_zones, weights=block_areas, minlength=bins)
+
+            if categorical:
+                class_index = np.clip(np.searchsorted(class_values, block_values), 0, class_count - 1)
+                known = class_values[class_index] == block_values
+                class_area_sqm += np.bincount(block_zones[known].astype(np.int64) * class_count + class_index[known],
+                                              weights=block_areas[known], minlength=bins * class_count)
+
+    # Drop the outside-of-zones bin and build the table
+    table = pd.DataFrame({
+        zone_ids.name or "zone": zone_ids.values,
+        "pixel_count": pixel_count[1:],
+        "sum": value_sum[1:],
+    })
+    with np.errstate(invalid="ignore", divide="ignore"):
+        table["mean"] = np.where(pixel_count[1:] > 0, value_sum[1:] / pixel_count[1:], np.nan)
+    table["area_acres"] = area_sqm[1:] / SQM_PER_ACRE
+    if categorical:
+        class_area_sqm = class_area_sqm.reshape(bins, class_count)[1:]
+        for i, value in enumerate(class_values):
+            # Without an explicit class list, only report values that occur
+            if classes is not None or class_area_sqm[:, i].any():
+                table[f"class_{value}_acres"] = class_area_sqm[:, i] / SQM_PER_ACRE
+
+    if os.path.splitext(output_path)[1].lower() in (".parquet", ".geoparquet"):
+        table.to_parquet(output_path, index=False)
+    else:
+        table.to_csv(output_path, index=False)
+
+    print(f"Zonal statistics for {zone_count} zones saved as {output_path}")
+
+    return table
+
+
+if __name__ == "__main__":
+    # Example usage
+    raster_path = r"D:\test_del\fsml_2024-02-07.tif"
+    zones_path = r"D:\1) Area Optimizations\2025\Bank_Al-Falah_TAY\1_shapefile\Bank-Al-Falah_Tando-Allahyar_deh_Boundary_sindh-board-of-revenue_Map.shp"
+    output_path = r"D:\test_del\fsml_2024-02-07_deh_summary.csv"
+
+    zonal_statistics(raster_path, zones_path, output_path, zone_field=None)